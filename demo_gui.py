@@ -11,7 +11,7 @@ from tkinter import ttk, messagebox, scrolledtext
 import json
 import threading
 import time
-from datetime import datetime
+from collections import deque
 
 
 class DemoGUI:
@@ -20,6 +20,14 @@ class DemoGUI:
         self.root.title("Netscapy GUI Demo")
         self.root.geometry("800x600")
 
+        # Pending output lines, flushed to the output widget in batches
+        self._log_buf = deque()
+        self._log_flush_pending = False
+
+        # Formatted log timestamp, recomputed at most once per second
+        self._ts_cache = ""
+        self._ts_cache_key = None
+
         self.create_widgets()
         self.setup_layout()
 
@@ -82,12 +90,32 @@ class DemoGUI:
         """Setup layout"""
         pass  # Already done in create_widgets
 
+    def _timestamp(self):
+        """Return the current time as HH:MM:SS, cached per second"""
+        ts = int(time.time())
+        if ts != self._ts_cache_key:
+            self._ts_cache = time.strftime("%H:%M:%S", time.localtime(ts))
+            self._ts_cache_key = ts
+        return self._ts_cache
+
     def log_message(self, message):
-        """Add message to output"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted = f"[{timestamp}] {message}\n"
-        self.output_text.insert(tk.END, formatted)
-        self.output_text.see(tk.END)
+        """Queue a message for the output"""
+        self._log_buf.append(f"[{self._timestamp()}] {message}\n")
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after(50, self._flush_log)
+
+    def _flush_log(self):
+        """Write all pending messages to the output"""
+        self._log_flush_pending = False
+        buf = self._log_buf
+        if not buf:
+            return
+        output_text = self.output_text
+        batch = "".join(buf)
+        buf.clear()
+        output_text.insert(tk.END, batch)
+        output_text.see(tk.END)
 
     def show_target_demo(self):
         """Show target input demo"""
@@ -151,6 +179,7 @@ class DemoGUI:
 
     def clear_output(self):
         """Clear the output"""
+        self._log_buf.clear()
         self.output_text.delete("1.0", tk.END)
 
 
@@ -8,20 +8,76 @@ A tkinter-based GUI that provides an intuitive interface for the netscapy tool.
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import threading
+import multiprocessing
+import signal
 import json
 import os
+import sys
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-import queue
+from collections import deque
 import time
 import re
 
 # Import the main scanner
 from main import NetworkScanner, TOOL_REGISTRY
 from utils.logger import get_logger
+from utils import json_io, scan_cache
 
 logger = get_logger()
 
+# Workers are spawned rather than forked: forking would copy a process that
+# is running Tk, the log listener and the scan executor threads
+_MP_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _init_worker(cancel_event):
+    """Start a watcher that tears down this worker when the scan is stopped"""
+    if hasattr(os, 'setsid'):
+        # Own process group, so the tool subprocesses can be signalled too
+        os.setsid()
+    threading.Thread(
+        target=_watch_cancel, args=(cancel_event,), daemon=True).start()
+
+
+def _watch_cancel(cancel_event):
+    cancel_event.wait()
+    if hasattr(os, 'killpg'):
+        os.killpg(os.getpgid(0), signal.SIGTERM)
+    else:
+        # No process groups on Windows; only the worker itself is stopped
+        os._exit(1)
+
+
+def _run_one_tool(target, tool, cache_ttl):
+    """Run a single tool scan in a worker process and return its scan entry"""
+    scanner = NetworkScanner(target, cache_ttl=cache_ttl)
+    scanner.run_scan(tool)
+    return scanner.results['scans'][tool]
+
+
+class _BatchedUpdates:
+    """Reentrant context that flushes pending redraws once, on outermost exit
+
+    Uses update_idletasks() rather than update(), which would also process
+    user events and force a full redraw.
+    """
+
+    def __init__(self, root):
+        self._root = root
+        self._depth = 0
+
+    def __enter__(self):
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            self._root.update_idletasks()
+        return False
+
 
 class ScannerGUI:
     def __init__(self, root):
@@ -36,15 +92,49 @@ class ScannerGUI:
         # Initialize variables
         self.scanner = None
         self.scan_thread = None
-        self.scan_queue = queue.Queue()
+        self._executor = None
+        self._futures = ()
+        self._cancel_event = None
+        self._batched_updates = _BatchedUpdates(self.root)
+
+        # Platform-specific "open in file manager", chosen once
+        if sys.platform == 'win32':
+            self._open_path = os.startfile
+        elif sys.platform == 'darwin':
+            self._open_path = lambda path: subprocess.Popen(['open', path])
+        else:
+            self._open_path = lambda path: subprocess.Popen(['xdg-open', path])
+        self._results_dir = Path("output/reports").resolve()
+        self._results_dir_seen = False
+        # Single producer (scan thread) / single consumer (Tk loop);
+        # deque append/popleft are atomic, so no extra locking is needed
+        self.scan_queue = deque()
         self.current_scan_results = {}
 
+        # Pending log lines, flushed to the log widget in batches
+        self._log_buf = deque()
+        self._log_flush_pending = False
+        self._log_lines = 0
+
+        # Formatted log timestamp, recomputed at most once per second
+        self._ts_cache = ""
+        self._ts_cache_key = None
+
+        # Raw JSON chunks still waiting to be inserted into the Raw JSON tab
+        self._raw_chunks = None
+        self._raw_insert_job = None
+
+        # Results waiting to be rendered into the Summary / Raw JSON tabs
+        self._pending_results = None
+        self._summary_dirty = False
+        self._raw_dirty = False
+
         # Create GUI components
         self.create_widgets()
         self.setup_layout()
 
-        # Start message processing
-        self.process_messages()
+        # Drain scan messages whenever a producer posts one
+        self.root.bind("<<ScanMsg>>", self._drain_queue)
 
     def setup_styles(self):
         """Configure ttk styles for a modern look"""
@@ -85,13 +175,24 @@ class ScannerGUI:
             self.target_frame, textvariable=self.target_var, width=40)
         self.target_entry.grid(row=0, column=1, sticky='ew', padx=(0, 10))
 
+        # Cached results are only reused when asked for, so a re-run
+        # within the cache TTL still scans by default
+        self.use_cache_var = tk.BooleanVar(value=False)
+        self.use_cache_check = ttk.Checkbutton(
+            self.target_frame,
+            text="Reuse recent results",
+            variable=self.use_cache_var
+        )
+        self.use_cache_check.grid(row=0, column=2, columnspan=2, sticky='w')
+
         # Tool selection
         ttk.Label(self.target_frame, text="Tools:").grid(
             row=1, column=0, sticky='w', padx=(0, 5), pady=(10, 0))
+        self._tools = tuple(TOOL_REGISTRY)
         self.tool_vars = {}
         self.tool_checkboxes = {}
 
-        for i, tool in enumerate(TOOL_REGISTRY.keys()):
+        for i, tool in enumerate(self._tools):
             var = tk.BooleanVar(value=tool == 'nmap')  # Default to nmap
             self.tool_vars[tool] = var
             cb = ttk.Checkbutton(
@@ -101,6 +202,8 @@ class ScannerGUI:
             )
             cb.grid(row=1, column=i+1, sticky='w', padx=(0, 10), pady=(10, 0))
             self.tool_checkboxes[tool] = cb
+        self._tool_getters = [(tool, self.tool_vars[tool].get)
+                              for tool in self._tools]
 
         # Scan control buttons
         self.scan_button = ttk.Button(
@@ -110,7 +213,7 @@ class ScannerGUI:
             style='Action.TButton'
         )
         self.scan_button.grid(row=2, column=0, columnspan=len(
-            TOOL_REGISTRY)+1, pady=(15, 0))
+            self._tools)+1, pady=(15, 0))
 
         self.stop_button = ttk.Button(
             self.target_frame,
@@ -119,7 +222,7 @@ class ScannerGUI:
             state='disabled'
         )
         self.stop_button.grid(row=2, column=len(
-            TOOL_REGISTRY)+1, pady=(15, 0), padx=(10, 0))
+            self._tools)+1, pady=(15, 0), padx=(10, 0))
 
         # Configure grid weights
         self.target_frame.columnconfigure(1, weight=1)
@@ -153,7 +256,10 @@ class ScannerGUI:
             self.log_frame,
             height=8,
             wrap=tk.WORD,
-            font=('Consolas', 9)
+            font=('Consolas', 9),
+            undo=False,
+            autoseparators=False,
+            maxundo=0
         )
         self.log_text.pack(fill='both', expand=True)
 
@@ -172,7 +278,10 @@ class ScannerGUI:
         self.summary_text = scrolledtext.ScrolledText(
             self.summary_frame,
             wrap=tk.WORD,
-            font=('Consolas', 9)
+            font=('Consolas', 9),
+            undo=False,
+            autoseparators=False,
+            maxundo=0
         )
         self.summary_text.pack(fill='both', expand=True)
 
@@ -188,10 +297,17 @@ class ScannerGUI:
         self.raw_text = scrolledtext.ScrolledText(
             self.raw_frame,
             wrap=tk.WORD,
-            font=('Consolas', 9)
+            font=('Consolas', 9),
+            undo=False,
+            autoseparators=False,
+            maxundo=0
         )
         self.raw_text.pack(fill='both', expand=True)
 
+        # Render text tabs only once they become visible
+        self.results_notebook.bind(
+            "<<NotebookTabChanged>>", self._on_tab_changed)
+
         # Action buttons for results
         self.results_buttons_frame = ttk.Frame(self.results_frame)
         self.results_buttons_frame.pack(fill='x', pady=(10, 0))
@@ -217,6 +333,15 @@ class ScannerGUI:
         )
         self.open_folder_button.pack(side='left')
 
+        # Exports are compact unless pretty-printing is requested
+        self.pretty_export_var = tk.BooleanVar(value=False)
+        self.pretty_export_check = ttk.Checkbutton(
+            self.results_buttons_frame,
+            text="Pretty-print export",
+            variable=self.pretty_export_var
+        )
+        self.pretty_export_check.pack(side='left', padx=(10, 0))
+
     def setup_layout(self):
         """Setup the main layout"""
         self.main_frame.pack(fill='both', expand=True)
@@ -233,18 +358,43 @@ class ScannerGUI:
         self.log_frame.pack(fill='both', expand=True, pady=(0, 10))
         self.results_frame.pack(fill='both', expand=True)
 
+    def _timestamp(self):
+        """Return the current time as HH:MM:SS, cached per second"""
+        ts = int(time.time())
+        if ts != self._ts_cache_key:
+            self._ts_cache = time.strftime("%H:%M:%S", time.localtime(ts))
+            self._ts_cache_key = ts
+        return self._ts_cache
+
     def log_message(self, message, level="INFO"):
-        """Add a message to the log display"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {level}: {message}\n"
+        """Queue a message for the log display"""
+        self._log_buf.append(f"[{self._timestamp()}] {level}: {message}\n")
+
+        # Flush all messages queued within the same 50 ms window at once
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after(50, self._flush_log)
+
+    def _flush_log(self):
+        """Write all pending log messages to the log display"""
+        self._log_flush_pending = False
+        buf = self._log_buf
+        if not buf:
+            return
 
-        self.log_text.insert(tk.END, formatted_message)
-        self.log_text.see(tk.END)
+        log_text = self.log_text
+        batch = "".join(buf)
+        buf.clear()
+        log_text.insert(tk.END, batch)
+        log_text.mark_set(tk.INSERT, tk.END)
+        log_text.see(tk.END)
 
-        # Limit log size
-        lines = self.log_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 1000:
-            self.log_text.delete("1.0", "500.0")
+        # Limit log size, tracking the line count instead of querying the widget
+        lines = self._log_lines + batch.count("\n")
+        if lines > 1000:
+            log_text.delete("1.0", "501.0")
+            lines -= 500
+        self._log_lines = lines
 
     def start_scan(self):
         """Start the scanning process"""
@@ -254,8 +404,7 @@ class ScannerGUI:
             return
 
         # Get selected tools
-        selected_tools = [tool for tool,
-                          var in self.tool_vars.items() if var.get()]
+        selected_tools = [tool for tool, get in self._tool_getters if get()]
         if not selected_tools:
             messagebox.showerror("Error", "Please select at least one tool")
             return
@@ -267,95 +416,160 @@ class ScannerGUI:
         self.status_var.set("Initializing scan...")
 
         # Clear previous results
+        self._pending_results = None
+        self._summary_dirty = self._raw_dirty = False
         self.summary_text.delete("1.0", tk.END)
+        self._cancel_raw_insert()
         self.raw_text.delete("1.0", tk.END)
 
         # Start scan in separate thread
+        cache_ttl = scan_cache.DEFAULT_TTL if self.use_cache_var.get() else None
+        self._cancel_event = _MP_CONTEXT.Event()
         self.scan_thread = threading.Thread(
             target=self.run_scan_thread,
-            args=(target, selected_tools),
+            args=(target, selected_tools, self._cancel_event, cache_ttl),
             daemon=True
         )
         self.scan_thread.start()
 
-    def run_scan_thread(self, target, tools):
-        """Run the scan in a separate thread"""
+    def run_scan_thread(self, target, tools, cancel_event, cache_ttl=None):
+        """Dispatch the scan to worker processes and report back to the UI"""
+        # A stopped scan's thread may still be unwinding after a new scan
+        # starts, so it only touches its own scanner and executor
+        executor = None
         try:
             # Create scanner
-            self.scanner = NetworkScanner(target)
+            scanner = self.scanner = NetworkScanner(target, cache_ttl=cache_ttl)
 
             # Update status
-            self.scan_queue.put(
-                ("status", f"Starting scan of {target} with tools: {', '.join(tools)}"))
-            self.scan_queue.put(("progress", 10))
-
-            # Run scans
-            results = self.scanner.run_scans(tools, max_workers=len(tools))
+            self._post(
+                "status", f"Starting scan of {target} with tools: {', '.join(tools)}")
+            self._post("progress", 10)
+
+            # Run each tool in its own process so result parsing is not
+            # serialized by the GIL; this thread only collects results
+            results = scanner.results
+            scanner.begin_scans()
+            max_workers = min(len(tools), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=_MP_CONTEXT,
+                initializer=_init_worker,
+                initargs=(cancel_event,)
+            ) as executor:
+                futures = {
+                    executor.submit(_run_one_tool, target, tool, cache_ttl): tool
+                    for tool in tools
+                }
+                self._executor = executor
+                self._futures = tuple(futures)
+                if cancel_event.is_set():
+                    self._cancel_workers()
+                for done, future in enumerate(as_completed(futures), 1):
+                    tool = futures[future]
+                    entry = future.result()
+                    if entry.get('cached'):
+                        self._post("status", f"Using cached {tool} results for {target}")
+                    scanner.record_scan(tool, entry)
+                    self._post("progress", 10 + 80 * done / len(tools))
+            scanner.finish_scans()
+            if cancel_event.is_set():
+                # Stopped by the user; a newer scan may already be running
+                return
 
             # Update results
             self.current_scan_results = results
-            self.scan_queue.put(("results", results))
-            self.scan_queue.put(("status", "Scan completed successfully"))
-            self.scan_queue.put(("progress", 100))
+            self._post("results", results)
+            self._post("status", "Scan completed successfully")
+            self._post("progress", 100)
 
         except Exception as e:
+            if cancel_event.is_set():
+                # Workers were torn down by stop_scan, which reports it
+                return
             error_msg = f"Scan failed: {str(e)}"
-            self.scan_queue.put(("error", error_msg))
+            self._post("error", error_msg)
             logger.error(error_msg)
 
+        finally:
+            if executor is not None and self._executor is executor:
+                self._executor = None
+                self._futures = ()
+
     def stop_scan(self):
-        """Stop the current scan"""
+        """Stop the current scan and terminate its worker processes"""
         if self.scan_thread and self.scan_thread.is_alive():
-            # Note: This is a basic implementation. For proper cancellation,
-            # we'd need to implement signal handling in the scanner classes
             self.status_var.set("Stopping scan...")
-            self.scan_queue.put(("status", "Scan stopped by user"))
-            self.scan_queue.put(("progress", 0))
+            self._cancel_event.set()
+            self._cancel_workers()
+            self._post("status", "Scan stopped by user")
+            self._post("progress", 0)
 
         self.scan_button.config(state='normal')
         self.stop_button.config(state='disabled')
 
-    def process_messages(self):
-        """Process messages from the scan thread"""
+    def _cancel_workers(self):
+        """Cancel pending tool scans; running ones exit via the cancel event"""
+        for future in self._futures:
+            future.cancel()
+        executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _post(self, msg_type, data):
+        """Queue a message for the UI thread and wake it up"""
+        self.scan_queue.append((msg_type, data))
+        try:
+            self.root.event_generate("<<ScanMsg>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # Window already destroyed
+            pass
+
+    def _drain_queue(self, event=None):
+        """Process all pending messages from the scan thread"""
+        if not self.scan_queue:
+            # An earlier <<ScanMsg>> already drained this burst; nothing
+            # changed, so skip the update_idletasks pass entirely
+            return
+
+        # Only the newest status/progress value is visible, so set each
+        # Tk variable once per drain instead of once per message
+        latest_status = None
+        latest_progress = None
         try:
-            while True:
-                try:
-                    msg_type, data = self.scan_queue.get_nowait()
+            with self._batched_updates:
+                while self.scan_queue:
+                    msg_type, data = self.scan_queue.popleft()
 
                     if msg_type == "status":
-                        self.status_var.set(data)
+                        latest_status = data
                         self.log_message(data)
                     elif msg_type == "progress":
-                        self.progress_var.set(data)
+                        latest_progress = data
                     elif msg_type == "results":
                         self.display_results(data)
                     elif msg_type == "error":
-                        self.status_var.set("Scan failed")
+                        latest_status = "Scan failed"
                         self.log_message(data, "ERROR")
                         messagebox.showerror("Scan Error", data)
                         self.scan_button.config(state='normal')
                         self.stop_button.config(state='disabled')
 
-                except queue.Empty:
-                    break
+                if latest_status is not None:
+                    self.status_var.set(latest_status)
+                if latest_progress is not None:
+                    self.progress_var.set(latest_progress)
 
         except Exception as e:
             logger.error(f"Error processing messages: {e}")
 
-        # Schedule next check
-        self.root.after(100, self.process_messages)
-
     def display_results(self, results):
         """Display scan results"""
         try:
-            # Update summary
-            summary = self.generate_summary(results)
-            self.summary_text.delete("1.0", tk.END)
-            self.summary_text.insert("1.0", summary)
-
-            # Update raw JSON
-            self.raw_text.delete("1.0", tk.END)
-            self.raw_text.insert("1.0", json.dumps(results, indent=2))
+            # Summary and raw JSON are rendered when their tab is shown
+            self._pending_results = results
+            self._summary_dirty = self._raw_dirty = True
+            self._on_tab_changed()
 
             # Update ports table
             self.update_ports_table(results)
@@ -371,34 +585,99 @@ class ScannerGUI:
             self.log_message(error_msg, "ERROR")
             logger.error(error_msg)
 
+    def _on_tab_changed(self, event=None):
+        """Render the selected results tab if its content is out of date"""
+        if self._pending_results is None:
+            return
+
+        selected = self.results_notebook.select()
+        if selected == str(self.summary_frame) and self._summary_dirty:
+            self._summary_dirty = False
+            summary = self.generate_summary(self._pending_results)
+            self.summary_text.delete("1.0", tk.END)
+            self.summary_text.insert("1.0", summary)
+        elif selected == str(self.raw_frame) and self._raw_dirty:
+            self._raw_dirty = False
+            self.start_raw_insert(self._pending_results)
+
+    def start_raw_insert(self, results):
+        """Stream results as JSON into the Raw JSON tab in chunks"""
+        self._cancel_raw_insert()
+        self.raw_text.delete("1.0", tk.END)
+        self._raw_chunks = self._iter_json_chunks(results)
+        # A timer, not after_idle: the update_idletasks() in _BatchedUpdates
+        # would otherwise run the whole chunk chain in one blocking pass
+        self._raw_insert_job = self.root.after(1, self._raw_insert_chunk)
+
+    def _iter_json_chunks(self, results, chunk_size=65536):
+        """Yield the indented JSON encoding of results in ~64 KB pieces"""
+        if json_io.orjson is not None:
+            # One fast native encode, then slice the text
+            text = json_io.dumps(results, pretty=True).decode()
+            for start in range(0, len(text), chunk_size):
+                yield text[start:start + chunk_size]
+            return
+
+        parts = []
+        size = 0
+        for part in json.JSONEncoder(indent=2).iterencode(results):
+            parts.append(part)
+            size += len(part)
+            if size >= chunk_size:
+                yield "".join(parts)
+                parts = []
+                size = 0
+        if parts:
+            yield "".join(parts)
+
+    def _raw_insert_chunk(self):
+        """Insert one JSON chunk and yield to the event loop before the next"""
+        self._raw_insert_job = None
+        chunk = next(self._raw_chunks, None)
+        if chunk is None:
+            self._raw_chunks = None
+            return
+        self.raw_text.insert(tk.END, chunk)
+        self._raw_insert_job = self.root.after(1, self._raw_insert_chunk)
+
+    def _cancel_raw_insert(self):
+        """Stop any in-progress Raw JSON insert"""
+        if self._raw_insert_job is not None:
+            self.root.after_cancel(self._raw_insert_job)
+            self._raw_insert_job = None
+        self._raw_chunks = None
+
+    _SUMMARY_HEADER = (
+        "{rule}\n"
+        "SCAN SUMMARY\n"
+        "{rule}\n"
+        "Target: {target}\n"
+        "Start Time: {start_time}\n"
+        "End Time: {end_time}\n"
+        "Tools Used: {tools_used}\n"
+    )
+
     def generate_summary(self, results):
         """Generate a human-readable summary of scan results"""
-        summary = []
-        summary.append("=" * 60)
-        summary.append("SCAN SUMMARY")
-        summary.append("=" * 60)
-        summary.append(f"Target: {results.get('target', 'Unknown')}")
-        summary.append(
-            f"Start Time: {results.get('metadata', {}).get('start_time', 'Unknown')}")
-        summary.append(
-            f"End Time: {results.get('metadata', {}).get('end_time', 'Unknown')}")
-        summary.append(
-            f"Tools Used: {', '.join(results.get('metadata', {}).get('tools_used', []))}")
-        summary.append("")
+        md = results.get('metadata') or {}
+        summary = [self._SUMMARY_HEADER.format(
+            rule="=" * 60,
+            target=results.get('target', 'Unknown'),
+            start_time=md.get('start_time', 'Unknown'),
+            end_time=md.get('end_time', 'Unknown'),
+            tools_used=', '.join(md.get('tools_used', []))
+        )]
 
         # Tool-specific results
-        scans = results.get('scans', {})
-        for tool, scan_info in scans.items():
-            summary.append(f"{tool.upper()} SCAN:")
-            summary.append("-" * 30)
+        rule = "-" * 30
+        for tool, scan_info in results.get('scans', {}).items():
             status = scan_info.get('status', 'unknown')
-            summary.append(f"Status: {status}")
-
-            if 'error' in scan_info and scan_info['error']:
-                summary.append(f"Error: {scan_info['error']}")
+            error = scan_info.get('error')
+            summary.append(f"{tool.upper()} SCAN:\n{rule}\nStatus: {status}")
+            if error:
+                summary.append(f"Error: {error}")
             elif 'results_file' in scan_info:
                 summary.append(f"Results File: {scan_info['results_file']}")
-
             summary.append("")
 
         return "\n".join(summary)
@@ -406,7 +685,8 @@ class ScannerGUI:
     def refresh_results(self):
         """Refresh the results display"""
         if self.current_scan_results:
-            self.display_results(self.current_scan_results)
+            with self._batched_updates:
+                self.display_results(self.current_scan_results)
             self.log_message("Results refreshed")
         else:
             messagebox.showinfo("Info", "No results to refresh")
@@ -425,8 +705,8 @@ class ScannerGUI:
 
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    json.dump(self.current_scan_results, f, indent=2)
+                json_io.dump(self.current_scan_results, filename,
+                             self.pretty_export_var.get())
                 self.log_message(f"Results exported to {filename}")
                 messagebox.showinfo(
                     "Success", f"Results exported to {filename}")
@@ -437,9 +717,11 @@ class ScannerGUI:
 
     def open_results_folder(self):
         """Open the results folder in file explorer"""
-        results_dir = Path("output/reports")
-        if results_dir.exists():
-            os.startfile(str(results_dir.absolute()))
+        # The folder is never removed once created, so stop checking after
+        # it has been found
+        if self._results_dir_seen or self._results_dir.is_dir():
+            self._results_dir_seen = True
+            self._open_path(str(self._results_dir))
         else:
             messagebox.showinfo("Info", "Results folder does not exist yet")
 
@@ -519,6 +801,7 @@ def main():
     def on_closing():
         if app.scan_thread and app.scan_thread.is_alive():
             if messagebox.askokcancel("Quit", "A scan is in progress. Do you want to quit?"):
+                app.stop_scan()
                 root.destroy()
         else:
             root.destroy()
@@ -8,6 +8,7 @@ This script helps set up the environment for the GUI.
 import sys
 import subprocess
 import os
+import shutil
 from pathlib import Path
 
 
@@ -59,15 +60,9 @@ def check_external_tools():
     missing_tools = []
 
     for tool, description in tools.items():
-        try:
-            result = subprocess.run([tool, '--version'],
-                                    capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print(f"✅ {tool}: {description}")
-            else:
-                print(f"⚠️  {tool}: Installed but may not work properly")
-                missing_tools.append(tool)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        if shutil.which(tool):
+            print(f"✅ {tool}: {description}")
+        else:
             print(f"❌ {tool}: Not found - {description}")
             missing_tools.append(tool)
 
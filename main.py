@@ -7,53 +7,104 @@ common security tools like Nmap, Nikto, and WhatWeb.
 """
 
 import argparse
-import json
-import sys
+import asyncio
+import atexit
 import concurrent.futures
+import functools
+import importlib
+import os
+import shutil
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import time
 
-# Import scanner modules
-from tools.nmap_scanner import NmapScanner
-from tools.nikto_scanner import NiktoScanner
-from tools.whatweb_scanner import WhatWebScanner
 from utils.logger import get_logger
+from utils import scan_cache, json_io
 
 # Initialize logger
 logger = get_logger()
 
-# Tool registry
+# Tool registry; scanner classes are given as "module:Class" and imported on
+# first use, so unused scanners cost nothing at startup
 TOOL_REGISTRY = {
     'nmap': {
-        'class': NmapScanner,
+        'class': 'tools.nmap_scanner:NmapScanner',
         'default_args': '-sV -sC -T4',
         'description': 'Port and service scanning with Nmap'
     },
     'nikto': {
-        'class': NiktoScanner,
+        'class': 'tools.nikto_scanner:NiktoScanner',
         'default_args': '-h',
         'description': 'Web server scanning with Nikto'
     },
     'whatweb': {
-        'class': WhatWebScanner,
+        'class': 'tools.whatweb_scanner:WhatWebScanner',
         'default_args': '--color=never --no-errors -a 3',
         'description': 'Web technology fingerprinting with WhatWeb'
     }
 }
 
+# Resolve each tool's binary once; None means it is not installed
+for _name, _config in TOOL_REGISTRY.items():
+    _config['path'] = shutil.which(_name)
+
+_TOOL_NAMES = tuple(TOOL_REGISTRY)
+_TOOL_NAMES_SET = frozenset(TOOL_REGISTRY)
+
+@functools.lru_cache(maxsize=None)
+def _load(cls_path: str) -> type:
+    """Import and return the class named by a "module:Class" path"""
+    module_name, class_name = cls_path.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+# Default number of concurrent scans: one per core, capped to avoid contention
+DEFAULT_MAX_WORKERS = min(16, os.cpu_count() or 4)
+
+# Threads for the scan cache's blocking file reads and writes, so they do
+# not stall the event loop; at most one get/put per tool is in flight
+_CACHE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=len(TOOL_REGISTRY), thread_name_prefix='scan-cache')
+atexit.register(_CACHE_EXECUTOR.shutdown, wait=True)
+
+# Single thread that writes per-tool result files while the next scans run
+_WRITER = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='json-writer')
+atexit.register(_WRITER.shutdown, wait=True)
+
 class NetworkScanner:
-    def __init__(self, target: str, output_dir: str = "output/reports"):
+    # Scans running in this process, keyed by (output_dir, target, tool, args),
+    # so a duplicate request waits for the running scan instead of starting one.
+    # This only coalesces within one process (e.g. concurrent run_scan_async
+    # calls in a CLI run); the GUI runs each tool in a fresh worker process,
+    # where this map never sees a duplicate. The GUI already has at most one
+    # scan running, and its tool list is one checkbox per tool.
+    _inflight: Dict[Tuple[str, str, str, str], concurrent.futures.Future] = {}
+    _inflight_lock = threading.Lock()
+    
+    def __init__(self, target: str, output_dir: str = "output/reports",
+                 cache_ttl: Optional[float] = scan_cache.DEFAULT_TTL,
+                 pretty: bool = False, max_workers: Optional[int] = None):
         """
         Initialize the network scanner
         
         Args:
             target: Target IP or hostname to scan
             output_dir: Directory to store scan results
+            cache_ttl: Seconds a completed scan is reused for the same
+                target, tool and arguments; None or 0 disables the cache
+            pretty: Write indented instead of compact JSON result files
+            max_workers: Maximum number of concurrent scans
         """
         self.target = target
+        self._safe_target = target.replace('/', '_')
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = scan_cache.ScanCache(self.output_dir / ".cache", cache_ttl) if cache_ttl else None
+        self.pretty = pretty
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self._pending_writes: List[concurrent.futures.Future] = []
+        self._tools_used: set = set()
         self.results: Dict[str, Any] = {
             'target': target,
             'scans': {},
@@ -75,11 +126,27 @@ class NetworkScanner:
         Returns:
             Dict containing the scan results
         """
+        result = asyncio.run(self.run_scan_async(tool_name, tool_args))
+        self._wait_for_writes()
+        return result
+    
+    async def run_scan_async(self, tool_name: str, tool_args: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a single scan, awaiting the tool's subprocess on the event loop
+        
+        Args:
+            tool_name: Name of the tool to use (must be in TOOL_REGISTRY)
+            tool_args: Optional arguments to pass to the tool
+            
+        Returns:
+            Dict containing the scan results; the results file is written in
+            the background, see _wait_for_writes
+        """
         if tool_name not in TOOL_REGISTRY:
             raise ValueError(f"Unknown tool: {tool_name}")
         
         tool_config = TOOL_REGISTRY[tool_name]
-        tool_class = tool_config['class']
+        tool_class = _load(tool_config['class'])
         
         # Use provided args or default args if none provided
         args = tool_args if tool_args is not None else tool_config.get('default_args', '')
@@ -87,26 +154,34 @@ class NetworkScanner:
         logger.info(f"Running {tool_name} scan on {self.target} with args: {args}")
         
         try:
-            # Initialize and run the scanner
-            scanner = tool_class(self.target, str(self.output_dir))
-            result = scanner.run_scan(args)
+            # Reuse a fresh result for the same target, tool and arguments
+            result = None
+            cache_key = None
+            if self.cache is not None:
+                cache_key = scan_cache.make_key(self.target, tool_name, args)
+                result = await asyncio.get_running_loop().run_in_executor(
+                    _CACHE_EXECUTOR, self.cache.get, cache_key)
+                if result is not None:
+                    logger.info(f"Using cached {tool_name} results for {self.target}")
             
-            # Save results
-            output_file = self.output_dir / f"{tool_name}_results_{self.target.replace('/', '_')}.json"
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
+            cached = result is not None
+            if not cached:
+                result = await self._run_tool_once(tool_name, tool_class, args, cache_key)
             
-            logger.info(f"{tool_name} scan completed. Results saved to {output_file}")
+            # Save results in the background so other scans keep running
+            output_file = self.output_dir / f"{tool_name}_results_{self._safe_target}.json"
+            self._pending_writes.append(
+                _WRITER.submit(self._write_result, tool_name, result, output_file))
             
             # Store results
             self.results['scans'][tool_name] = {
                 'status': result.get('status', 'unknown'),
                 'results_file': str(output_file),
-                'error': result.get('error')
+                'error': result.get('error'),
+                'cached': cached
             }
             
-            if tool_name not in self.results['metadata']['tools_used']:
-                self.results['metadata']['tools_used'].append(tool_name)
+            self._record_tool_used(tool_name)
             
             return result
             
@@ -119,29 +194,75 @@ class NetworkScanner:
                 'error': error_msg
             }
             
-            if tool_name not in self.results['metadata']['tools_used']:
-                self.results['metadata']['tools_used'].append(tool_name)
+            self._record_tool_used(tool_name)
             
             return {'error': error_msg}
     
-    def run_scans(self, tools: List[str], tool_args: Optional[Dict[str, str]] = None, max_workers: int = 3) -> Dict[str, Any]:
+    async def _run_tool_once(self, tool_name: str, tool_class: Any, args: str,
+                             cache_key: Optional[str]) -> Dict[str, Any]:
+        """Run a tool, sharing the result with identical scans already in flight"""
+        key = (str(self.output_dir), self.target, tool_name, args)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+        
+        if not owner:
+            logger.info(f"Waiting for in-progress {tool_name} scan of {self.target}")
+            return await asyncio.wrap_future(future)
+        
+        try:
+            binary_path = TOOL_REGISTRY[tool_name]['path']
+            if binary_path is None:
+                raise FileNotFoundError(f"{tool_name} is not installed or not on PATH")
+            
+            # Initialize and run the scanner
+            scanner = tool_class(self.target, str(self.output_dir), binary_path)
+            result = await scanner.run_scan_async(args)
+            if cache_key is not None and result.get('status') == 'completed':
+                await asyncio.get_running_loop().run_in_executor(
+                    _CACHE_EXECUTOR, self.cache.put, cache_key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _record_tool_used(self, tool_name: str) -> None:
+        """Add tool_name to the tools_used metadata once"""
+        if tool_name not in self._tools_used:
+            self._tools_used.add(tool_name)
+            self.results['metadata']['tools_used'].append(tool_name)
+    
+    def run_scans(self, tools: List[str], tool_args: Optional[Dict[str, str]] = None, max_workers: Optional[int] = None,
+                  combined: bool = True) -> Dict[str, Any]:
         """
-        Run multiple scans in parallel
+        Run multiple scans concurrently
         
         Args:
             tools: List of tool names to run
             tool_args: Optional dict mapping tool names to their arguments
-            max_workers: Maximum number of concurrent scans
+            max_workers: Maximum number of concurrent scans; defaults to the
+                value given at construction
+            combined: Also write combined_results_<target>.json
             
         Returns:
             Dict containing combined results from all scans
         """
         if tool_args is None:
             tool_args = {}
+        if max_workers is None:
+            max_workers = self.max_workers
         
-        # Filter out unknown tools
-        valid_tools = [t for t in tools if t in TOOL_REGISTRY]
-        unknown_tools = set(tools) - set(valid_tools)
+        # Filter out unknown tools (the CLI already rejects them; this is for
+        # programmatic callers)
+        valid_tools = [t for t in tools if t in _TOOL_NAMES_SET]
+        unknown_tools = set(tools) - _TOOL_NAMES_SET
         
         if unknown_tools:
             logger.warning(f"Unknown tools will be skipped: {', '.join(unknown_tools)}")
@@ -149,35 +270,85 @@ class NetworkScanner:
         if not valid_tools:
             raise ValueError("No valid tools specified")
         
-        # Update metadata
+        self.begin_scans()
+        
+        # Run scans concurrently on a single event loop
+        asyncio.run(self._run_scans_async(valid_tools, tool_args, max_workers))
+        self._wait_for_writes()
+        
+        self.finish_scans(combined)
+        
+        return self.results
+    
+    def begin_scans(self) -> None:
+        """Record the start of a multi-tool scan in the metadata"""
         self.results['metadata']['start_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def record_scan(self, tool_name: str, entry: Dict[str, Any]) -> None:
+        """
+        Store the scan entry of a tool that was run elsewhere
         
-        # Run scans in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for tool in valid_tools:
-                args = tool_args.get(tool, None)
-                future = executor.submit(self.run_scan, tool, args)
-                futures.append(future)
-            
-            # Wait for all scans to complete
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(f"Scan failed: {str(e)}")
-        
-        # Update metadata
+        Used by callers that run tools outside this scanner, e.g. the GUI's
+        worker processes, so their bookkeeping matches run_scans.
+        
+        Args:
+            tool_name: Name of the tool that was run
+            entry: That scanner's results['scans'][tool_name] entry
+        """
+        self.results['scans'][tool_name] = entry
+        self._record_tool_used(tool_name)
+    
+    def finish_scans(self, combined: bool = True) -> None:
+        """
+        Record the end of a multi-tool scan and save the combined results
+        
+        Args:
+            combined: Also write combined_results_<target>.json
+        """
         self.results['metadata']['end_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        if combined:
+            self.save_combined_results()
+    
+    async def _run_scans_async(self, tools: List[str], tool_args: Dict[str, str], max_workers: int) -> None:
+        """Await all tool scans, running at most max_workers at a time"""
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        async def run_one(tool: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run_scan_async(tool, tool_args.get(tool, None))
+        
+        outcomes = await asyncio.gather(*(run_one(t) for t in tools), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Scan failed: {str(outcome)}")
+    
+    def _write_result(self, tool_name: str, result: Dict[str, Any], output_file: Path) -> None:
+        """Write a single tool's results file (runs on the writer thread)"""
+        json_io.dump(result, output_file, self.pretty)
+        logger.info(f"{tool_name} scan completed. Results saved to {output_file}")
+    
+    def _wait_for_writes(self) -> None:
+        """Block until all queued result files have been written"""
+        pending, self._pending_writes = self._pending_writes, []
+        for future in concurrent.futures.as_completed(pending):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error saving results: {str(e)}")
+    
+    def save_combined_results(self) -> Path:
+        """
+        Save the combined results of all scans run so far
         
-        # Save combined results
-        combined_file = self.output_dir / f"combined_results_{self.target.replace('/', '_')}.json"
-        with open(combined_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        Returns:
+            Path to the combined results file
+        """
+        combined_file = self.output_dir / f"combined_results_{self._safe_target}.json"
+        json_io.dump(self.results, combined_file, self.pretty)
         
         logger.info(f"All scans completed. Combined results saved to {combined_file}")
         
-        return self.results
+        return combined_file
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -194,7 +365,7 @@ def parse_arguments():
     parser.add_argument(
         '--tools',
         nargs='+',
-        choices=list(TOOL_REGISTRY.keys()),
+        choices=_TOOL_NAMES,
         default=['nmap'],
         help='Tools to run (space-separated)'
     )
@@ -205,13 +376,38 @@ def parse_arguments():
         help='Directory to save scan results'
     )
     
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=scan_cache.DEFAULT_TTL,
+        help='Seconds to reuse a completed scan of the same target, tool and arguments'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run the tools instead of reusing cached results'
+    )
+    
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write indented JSON result files instead of compact JSON'
+    )
+    
     parser.add_argument(
         '--max-workers',
         type=int,
-        default=3,
+        default=DEFAULT_MAX_WORKERS,
         help='Maximum number of concurrent scans'
     )
     
+    parser.add_argument(
+        '--no-combined',
+        action='store_true',
+        help='Skip writing the combined results file'
+    )
+    
     # Add tool-specific argument groups
     for tool, config in TOOL_REGISTRY.items():
         group = parser.add_argument_group(f"{tool} options")
@@ -229,17 +425,19 @@ def main():
         args = parse_arguments()
         
         # Create scanner instance
-        scanner = NetworkScanner(args.target, args.output_dir)
+        cache_ttl = None if args.no_cache else args.cache_ttl
+        scanner = NetworkScanner(args.target, args.output_dir, cache_ttl, args.pretty,
+                                 args.max_workers)
         
         # Prepare tool arguments
         tool_args = {}
-        for tool in TOOL_REGISTRY.keys():
+        for tool in _TOOL_NAMES:
             arg_name = f"{tool}_args"
             if hasattr(args, arg_name):
                 tool_args[tool] = getattr(args, arg_name)
         
         # Run scans
-        scanner.run_scans(args.tools, tool_args, args.max_workers)
+        scanner.run_scans(args.tools, tool_args, combined=not args.no_combined)
         
         print(f"\nScan completed! Results saved to: {args.output_dir}")
         
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+
+from tools.nikto_scanner import NiktoScanner
+
+# Nikto -Format xml output: items nested inside <scandetails>, one item with
+# a duplicated known child, extra child tags, and an empty extra tag
+_XML = """<?xml version="1.0" ?>
+<niktoscan hoststest="0" options="-h 10.0.0.1" version="2.1.6">
+<scandetails targetip="10.0.0.1" targethostname="web.local" targetport="80" targetbanner="nginx/1.18.0" starttime="2024-01-15 10:30:00" sitename="http://web.local:80/" siteip="http://10.0.0.1:80/" hostheader="web.local" errors="0" checks="6544">
+<item id="999100" osvdbid="0" osvdblink="" method="GET">
+<description><![CDATA[/: The anti-clickjacking X-Frame-Options header is not present.]]></description>
+<uri><![CDATA[/]]></uri>
+<namelink name="http://web.local:80/" method="GET"/>
+<iplink><![CDATA[http://10.0.0.1:80/]]></iplink>
+</item>
+<item id="001234" osvdbid="3092" osvdblink="http://osvdb.org/3092" method="GET">
+<description><![CDATA[/admin/: This might be interesting.]]></description>
+<description><![CDATA[second description is ignored]]></description>
+<uri><![CDATA[/admin/]]></uri>
+<uri><![CDATA[/ignored/]]></uri>
+<namelink name="http://web.local:80/admin/" method="HEAD"/>
+<namelink name="http://ignored/" method="POST"/>
+<iplink><![CDATA[http://10.0.0.1:80/admin/]]></iplink>
+<references><![CDATA[CVE-2003-1418]]></references>
+<references><![CDATA[CVE-2022-0001]]></references>
+<note></note>
+</item>
+<error details="timeout">Connection timed out</error>
+<statistics elapsed="12" itemsfound="2" itemstested="6544" endtime="2024-01-15 10:30:12"/>
+</scandetails>
+</niktoscan>
+"""
+
+_SCAN_DETAILS = {
+    'target_ip': '10.0.0.1',
+    'target_hostname': 'web.local',
+    'target_port': '80',
+    'target_banner': 'nginx/1.18.0',
+    'start_time': '2024-01-15 10:30:00',
+    'site_name': 'http://web.local:80/',
+    'site_ip': 'http://10.0.0.1:80/',
+    'host_header': 'web.local',
+    'errors': [{'message': 'Connection timed out', 'details': 'timeout'}],
+}
+
+_VULNERABILITIES = [
+    {
+        'id': '999100',
+        'osvdb_id': '0',
+        'osvdb_link': '',
+        'description': '/: The anti-clickjacking X-Frame-Options header is not present.',
+        'uri': '/',
+        'name': 'http://web.local:80/',
+        'method': 'GET',
+        'iplink': 'http://10.0.0.1:80/',
+    },
+    {
+        'id': '001234',
+        'osvdb_id': '3092',
+        'osvdb_link': 'http://osvdb.org/3092',
+        # The first of each duplicated known child wins
+        'description': '/admin/: This might be interesting.',
+        'uri': '/admin/',
+        'name': 'http://web.local:80/admin/',
+        'method': 'HEAD',
+        'iplink': 'http://10.0.0.1:80/admin/',
+        # Extra child tags keep the last non-empty text
+        'references': 'CVE-2022-0001',
+    },
+]
+
+
+class ParseNiktoXmlTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.scanner = NiktoScanner("10.0.0.1", self.tmp.name, "nikto")
+
+    def test_parses_details_and_items(self):
+        self.scanner.output_file.write_text(_XML)
+
+        self.scanner._parse_nikto_xml()
+
+        results = self.scanner.results
+        self.assertNotIn('error', results)
+        self.assertEqual(results['scan_details'], _SCAN_DETAILS)
+        self.assertEqual(results['scan_results']['vulnerabilities'], _VULNERABILITIES)
+
+    def test_missing_file_sets_error(self):
+        self.scanner._parse_nikto_xml()
+
+        self.assertIn("not found", self.scanner.results['error'])
+        self.assertEqual(self.scanner.results['scan_results']['vulnerabilities'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import stat
+import tempfile
+import unittest
+import xml.etree.ElementTree as StdET
+from unittest import mock
+
+from tools import nmap_scanner
+from tools.nmap_scanner import NmapScanner
+
+# Two hosts in the shape of `nmap -oX -` output
+_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap" args="nmap -sV -oX - 10.0.0.1 10.0.0.2">
+<host><status state="up"/>
+<address addr="10.0.0.1" addrtype="ipv4"/>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="8.9p1" extrainfo="Ubuntu Linux; protocol 2.0"/></port>
+<port protocol="tcp" portid="80"><state state="open"/><service name="http" product="nginx"/></port>
+</ports>
+</host>
+<host><status state="up"/>
+<address addr="10.0.0.2" addrtype="ipv4"/>
+<ports>
+<port protocol="udp" portid="53"><state state="open|filtered"/></port>
+</ports>
+</host>
+<runstats><finished elapsed="1.23"/></runstats>
+</nmaprun>
+"""
+
+_HOST1_PORTS = [
+    {"host": "10.0.0.1", "port": "22", "protocol": "tcp", "state": "open",
+     "service": "ssh", "version": "OpenSSH 8.9p1 (Ubuntu Linux; protocol 2.0)"},
+    {"host": "10.0.0.1", "port": "80", "protocol": "tcp", "state": "open",
+     "service": "http", "version": "nginx"},
+]
+
+_HOST2_PORTS = [
+    {"host": "10.0.0.2", "port": "53", "protocol": "udp", "state": "open|filtered",
+     "service": "", "version": ""},
+]
+
+# The PORT table of the same scan in normal (-oN) output
+_TXT = """Starting Nmap 7.94 ( https://nmap.org )
+Nmap scan report for 10.0.0.1
+Host is up (0.00050s latency).
+PORT   STATE SERVICE VERSION
+22/tcp open  ssh     OpenSSH 8.9p1 Ubuntu 3 (Ubuntu Linux; protocol 2.0)
+80/tcp open  http    nginx
+443/tcp closed https
+
+Nmap done: 1 IP address (1 host up) scanned in 1.23 seconds
+"""
+
+
+class _FakeStream:
+    """Async stream that returns data in fixed-size pieces"""
+
+    def __init__(self, data, piece=7):
+        self._data = data
+        self._piece = piece
+
+    async def read(self, n=-1):
+        size = min(n, self._piece) if n > 0 else self._piece
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk
+
+
+class ReadXmlPortsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.scanner = NmapScanner("10.0.0.1", self.tmp.name, "nmap")
+
+    def _parsers(self):
+        """The parser module in use, plus the stdlib fallback if that differs"""
+        parsers = [nmap_scanner.ET]
+        if nmap_scanner.ET is not StdET:
+            parsers.append(StdET)
+        return parsers
+
+    def _read(self, data):
+        stream = _FakeStream(data)
+        ports = asyncio.run(self.scanner._read_xml_ports(stream))
+        return ports, stream
+
+    def test_complete_xml(self):
+        for parser in self._parsers():
+            with self.subTest(parser=parser.__name__), \
+                    mock.patch.object(nmap_scanner, 'ET', parser):
+                ports, _ = self._read(_XML)
+                self.assertEqual(ports, _HOST1_PORTS + _HOST2_PORTS)
+
+    def test_truncated_xml_keeps_completed_hosts(self):
+        cut = _XML.index(b'portid="53"')
+        # nmap killed mid-host, and a corrupt byte followed by more output
+        for data in (_XML[:cut], _XML[:cut] + b"<<garbage" + _XML[cut:]):
+            for parser in self._parsers():
+                with self.subTest(parser=parser.__name__, size=len(data)), \
+                        mock.patch.object(nmap_scanner, 'ET', parser):
+                    ports, stream = self._read(data)
+                    self.assertEqual(ports, _HOST1_PORTS)
+                    # The rest of the stream is drained so nmap is not blocked
+                    self.assertEqual(stream._data, b"")
+
+
+class ParseNmapPortsTest(unittest.TestCase):
+    def test_txt_fallback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            scanner = NmapScanner("10.0.0.1", tmp, "nmap")
+            ports = scanner.parse_nmap_ports(_TXT)
+
+        self.assertEqual(ports, [
+            {"port": "22", "protocol": "tcp", "state": "open", "service": "ssh",
+             "version": "OpenSSH 8.9p1 Ubuntu 3 (Ubuntu Linux; protocol 2.0)"},
+            {"port": "80", "protocol": "tcp", "state": "open", "service": "http",
+             "version": "nginx"},
+            {"port": "443", "protocol": "tcp", "state": "closed", "service": "https",
+             "version": ""},
+        ])
+
+
+    def test_run_scan_falls_back_to_txt_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # A fake nmap that writes the -oN report but no XML on stdout
+            binary = os.path.join(tmp, "nmap")
+            with open(binary, 'w') as f:
+                f.write(f"#!/bin/sh\ncat > \"$2\" <<'TXT'\n{_TXT}TXT\n")
+            os.chmod(binary, os.stat(binary).st_mode | stat.S_IEXEC)
+
+            results = NmapScanner("10.0.0.1", tmp, binary).run_scan("-sV")
+
+        self.assertEqual(results['status'], 'completed')
+        self.assertEqual([p['port'] for p in results['ports']], ["22", "80", "443"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import stat
+import tempfile
+import textwrap
+import unittest
+
+from tools.whatweb_scanner import WhatWebScanner
+
+# One --log-json element in WhatWeb's real shape: 'target' is the URL string
+_RESULT = {
+    "target": "http://example.com",
+    "http_status": 200,
+    "request_config": {"headers": {"User-Agent": "WhatWeb/0.5.5"}},
+    "plugins": {
+        "HTTPServer": {"string": ["nginx"]},
+        "IP": {"string": ["93.184.216.34"]},
+        "Title": {"string": ["Example Domain"]}
+    }
+}
+
+
+class RunBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _fake_whatweb(self, output):
+        """Write an executable that prints output regardless of arguments"""
+        path = os.path.join(self.tmp.name, "whatweb")
+        with open(path, 'w') as f:
+            f.write(textwrap.dedent(f"""\
+                #!/bin/sh
+                cat <<'JSON'
+                {output}
+                JSON
+                """))
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def _run_batch(self, targets, output):
+        binary = self._fake_whatweb(output)
+        old_path = os.environ.get('PATH', '')
+        os.environ['PATH'] = f"{os.path.dirname(binary)}{os.pathsep}{old_path}"
+        self.addCleanup(os.environ.__setitem__, 'PATH', old_path)
+        return WhatWebScanner.run_batch(targets, output_dir=self.tmp.name)
+
+    def test_string_target_matches_scanner(self):
+        results = self._run_batch(["example.com"], json.dumps([_RESULT]))
+
+        self.assertEqual(results[0]['status'], 'completed')
+        scan = results[0]['scan_results']
+        self.assertEqual(scan['url'], "http://example.com")
+        self.assertEqual(scan['ip'], "93.184.216.34")
+        self.assertEqual(scan['technologies']['web_server'], "nginx")
+
+    def test_target_without_result_fails(self):
+        results = self._run_batch(["example.com", "other.org"], json.dumps([_RESULT]))
+
+        self.assertEqual(results[0]['status'], 'completed')
+        self.assertEqual(results[1]['status'], 'failed')
+        self.assertEqual(results[1]['error'], "No WhatWeb result for target")
+
+    def test_malformed_element_is_skipped(self):
+        other = dict(_RESULT, target="http://other.org")
+        output = json.dumps([{"target": 5}, "junk", _RESULT, other])
+        results = self._run_batch(["example.com", "other.org"], output)
+
+        self.assertEqual([r['status'] for r in results], ['completed', 'completed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
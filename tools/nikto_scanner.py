@@ -1,21 +1,35 @@
-import subprocess
-import json
+import asyncio
+import logging
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, Any, Optional
 import os
+import shutil
 import re
 import time
 
 from utils.logger import get_logger
+from utils import json_io
 
 logger = get_logger()
 
+# ANSI escape sequences (colours, cursor moves) in Nikto's progress output
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Number of Nikto output lines per debug log record
+_DEBUG_BATCH_LINES = 64
+
+# <item> children mapped to fixed vulnerability fields
+_ITEM_FIELDS = frozenset(('description', 'uri', 'namelink', 'iplink'))
+
 class NiktoScanner:
-    def __init__(self, target: str, output_dir: str = "output/reports"):
+    def __init__(self, target: str, output_dir: str = "output/reports",
+                 binary_path: Optional[str] = None):
         self.target = target
+        self._safe_target = target.replace('/', '_')
         self.output_dir = output_dir
-        self.output_file = Path(self.output_dir) / f"nikto_scan_{self.target.replace('/', '_')}.xml"
+        self.binary_path = binary_path or shutil.which("nikto") or "nikto"
+        self.output_file = Path(self.output_dir) / f"nikto_scan_{self._safe_target}.xml"
         self.results: Dict[str, Any] = {
             'target': target,
             'scan_results': {
@@ -32,6 +46,18 @@ class NiktoScanner:
         """
         Run Nikto scan with the specified arguments
         
+        Args:
+            arguments (str): Nikto command line arguments
+            
+        Returns:
+            dict: Scan results
+        """
+        return asyncio.run(self.run_scan_async(arguments))
+    
+    async def run_scan_async(self, arguments: str = "-h") -> Dict[str, Any]:
+        """
+        Run Nikto scan without blocking the event loop while Nikto runs
+        
         Args:
             arguments (str): Nikto command line arguments
             
@@ -40,7 +66,7 @@ class NiktoScanner:
         """
         try:
             # Build the Nikto command
-            cmd = ["nikto", "-o", str(self.output_file), "-Format", "xml"]
+            cmd = [self.binary_path, "-o", str(self.output_file), "-Format", "xml"]
             
             # Add the target and any additional arguments
             cmd.extend(arguments.split())
@@ -49,30 +75,32 @@ class NiktoScanner:
             logger.info(f"Running Nikto scan: {' '.join(cmd)}")
             
             # Execute Nikto
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
             # Update status
             self.results['status'] = 'running'
             self.results['start_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
             
-            # Stream output
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    # Clean up Nikto's progress output
-                    clean_output = re.sub(r'\x1b\[.*?m', '', output).strip()
-                    if clean_output:
-                        logger.debug(f"Nikto output: {clean_output}")
+            # Nikto's progress output is only logged, so there is no need to
+            # stream it line by line; collect it in one go
+            stdout, stderr = await process.communicate()
+            stdout = stdout.decode(errors='replace')
+            stderr = stderr.decode(errors='replace')
+            
+            # Clean up Nikto's progress output, logged in batches of lines
+            if logger.isEnabledFor(logging.DEBUG):
+                lines = [clean_output for clean_output in
+                         (line.strip() for line in _ANSI_RE.sub('', stdout).splitlines())
+                         if clean_output]
+                for start in range(0, len(lines), _DEBUG_BATCH_LINES):
+                    logger.debug("Nikto output:\n%s",
+                                 "\n".join(lines[start:start + _DEBUG_BATCH_LINES]))
             
             # Check for errors
-            stderr = process.stderr.read()
             if stderr:
                 error_msg = f"Nikto error: {stderr}"
                 logger.error(error_msg)
@@ -102,58 +130,70 @@ class NiktoScanner:
             if not self.output_file.exists():
                 raise FileNotFoundError(f"Nikto XML output file not found: {self.output_file}")
             
-            tree = ET.parse(self.output_file)
-            root = tree.getroot()
-            
-            # Extract scan details
-            scandetails = root.find('scandetails')
-            if scandetails is not None:
-                self.results['scan_details'] = {
-                    'target_ip': scandetails.get('targetip', ''),
-                    'target_hostname': scandetails.get('targethostname', ''),
-                    'target_port': scandetails.get('targetport', ''),
-                    'target_banner': scandetails.get('targetbanner', ''),
-                    'start_time': scandetails.get('starttime', ''),
-                    'site_name': scandetails.get('sitename', ''),
-                    'site_ip': scandetails.get('siteip', ''),
-                    'host_header': scandetails.get('hostheader', ''),
-                    'errors': []
-                }
-                
-                # Extract any scan errors
-                for error in scandetails.findall('error'):
-                    self.results['scan_details']['errors'].append({
-                        'message': error.text,
-                        'details': error.get('details', '')
-                    })
-            
-            # Extract vulnerabilities
-            for item in root.findall('.//item'):
-                vulnerability = {
-                    'id': item.get('id', ''),
-                    'osvdb_id': item.get('osvdbid', ''),
-                    'osvdb_link': item.get('osvdblink', ''),
-                    'description': item.find('description').text if item.find('description') is not None else '',
-                    'uri': item.find('uri').text if item.find('uri') is not None else '',
-                    'name': item.find('namelink').get('name', '') if item.find('namelink') is not None else '',
-                    'method': item.find('namelink').get('method', '') if item.find('namelink') is not None else '',
-                    'iplink': item.find('iplink').text if item.find('iplink') is not None else '',
-                }
-                
-                # Extract additional details
-                for elem in item:
-                    if elem.tag not in ['description', 'uri', 'namelink', 'iplink'] and elem.text:
-                        vulnerability[elem.tag] = elem.text
-                
-                self.results['scan_results']['vulnerabilities'].append(vulnerability)
-            
-            logger.info(f"Found {len(self.results['scan_results']['vulnerabilities'])} potential vulnerabilities")
+            vulnerabilities = self.results['scan_results']['vulnerabilities']
+            
+            # Single streaming pass; each <item> is freed once converted
+            for _, elem in ET.iterparse(self.output_file, events=('end',)):
+                if elem.tag == 'item':
+                    vulnerabilities.append(self._item_to_dict(elem))
+                    elem.clear()
+                elif elem.tag == 'scandetails' and 'scan_details' not in self.results:
+                    self.results['scan_details'] = self._scandetails_to_dict(elem)
+            
+            logger.info(f"Found {len(vulnerabilities)} potential vulnerabilities")
             
         except Exception as e:
             error_msg = f"Error parsing Nikto XML: {str(e)}"
             logger.error(error_msg)
             self.results['error'] = error_msg
     
+    def _scandetails_to_dict(self, scandetails) -> Dict[str, Any]:
+        """Convert a <scandetails> element into the scan details dict"""
+        return {
+            'target_ip': scandetails.get('targetip', ''),
+            'target_hostname': scandetails.get('targethostname', ''),
+            'target_port': scandetails.get('targetport', ''),
+            'target_banner': scandetails.get('targetbanner', ''),
+            'start_time': scandetails.get('starttime', ''),
+            'site_name': scandetails.get('sitename', ''),
+            'site_ip': scandetails.get('siteip', ''),
+            'host_header': scandetails.get('hostheader', ''),
+            'errors': [
+                {'message': error.text, 'details': error.get('details', '')}
+                for error in scandetails.findall('error')
+            ]
+        }
+    
+    def _item_to_dict(self, item) -> Dict[str, Any]:
+        """Convert an <item> element into a vulnerability dict in one pass"""
+        vulnerability = {
+            'id': item.get('id', ''),
+            'osvdb_id': item.get('osvdbid', ''),
+            'osvdb_link': item.get('osvdblink', ''),
+            'description': '',
+            'uri': '',
+            'name': '',
+            'method': '',
+            'iplink': '',
+        }
+        found = set()
+        for child in item:
+            tag = child.tag
+            if tag in _ITEM_FIELDS:
+                # Like find(), only the first child with a known tag counts
+                if tag in found:
+                    continue
+                found.add(tag)
+                if tag == 'namelink':
+                    vulnerability['name'] = child.get('name', '')
+                    vulnerability['method'] = child.get('method', '')
+                else:
+                    vulnerability[tag] = child.text
+            elif child.text:
+                # Additional details
+                vulnerability[tag] = child.text
+        return vulnerability
+    
     def save_results(self, output_file: Optional[str] = None) -> str:
         """
         Save scan results to a JSON file
@@ -166,12 +206,11 @@ class NiktoScanner:
         """
         try:
             if not output_file:
-                output_file = Path(self.output_dir) / f"nikto_scan_{self.target.replace('/', '_')}.json"
+                output_file = Path(self.output_dir) / f"nikto_scan_{self._safe_target}.json"
             else:
                 output_file = Path(output_file)
             
-            with open(output_file, 'w') as f:
-                json.dump(self.results, f, indent=4)
+            json_io.dump(self.results, output_file)
             
             logger.info(f"Saved Nikto scan results to {output_file}")
             return str(output_file)
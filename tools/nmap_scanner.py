@@ -1,26 +1,40 @@
-import subprocess
-import json
+import asyncio
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import os
+import shutil
+import re
 from utils.logger import get_logger
+from utils import json_io
+
+try:
+    from lxml import etree as ET
+except ImportError:  # Optional: the stdlib parser has the same pull API
+    import xml.etree.ElementTree as ET
 
 logger = get_logger()
 
+# One row of the PORT table in Nmap's normal output, e.g.
+# "22/tcp open  ssh     OpenSSH 8.9p1"
+_PORT_RE = re.compile(
+    r'^[ \t]*(\d+)/(\w+)[ \t]+(\w+)[ \t]+(\S+)(?:[ \t]+(.+?))?[ \t]*$', re.MULTILINE)
+
 
 class NmapScanner:
-    def __init__(self, target: str, output_dir: str = "output/reports"):
+    def __init__(self, target: str, output_dir: str = "output/reports",
+                 binary_path: Optional[str] = None):
         self.target = target
+        self._safe_target = target.replace('/', '_')
         self.output_dir = output_dir
+        self.binary_path = binary_path or shutil.which("nmap") or "nmap"
         self.txt_output_file = Path(
-            self.output_dir) / f"nmap_scan_{self.target.replace('/', '_')}.txt"
+            self.output_dir) / f"nmap_scan_{self._safe_target}.txt"
         self.json_output_file = Path(
-            self.output_dir) / f"nmap_scan_{self.target.replace('/', '_')}.json"
+            self.output_dir) / f"nmap_scan_{self._safe_target}.json"
         self.results: Dict[str, Any] = {
             'target': target,
             'status': 'pending',
             'txt_file': str(self.txt_output_file),
-            'raw_output': '',
             'error': None
         }
         os.makedirs(self.output_dir, exist_ok=True)
@@ -29,38 +43,49 @@ class NmapScanner:
         """
         Run Nmap scan with the specified arguments, save as TXT and JSON only.
         """
+        return asyncio.run(self.run_scan_async(arguments))
+
+    async def run_scan_async(self, arguments: str = "-sV -sC -T4") -> Dict[str, Any]:
+        """
+        Run Nmap scan without blocking the event loop while nmap runs.
+        """
         try:
-            # Build the Nmap command
-            cmd = ["nmap", "-oN", str(self.txt_output_file)] + \
+            # Build the Nmap command; XML goes to stdout for parsing and the
+            # normal output to the human-readable TXT report
+            cmd = [self.binary_path, "-oN", str(self.txt_output_file), "-oX", "-"] + \
                 arguments.split() + [self.target]
             logger.info(f"Running Nmap scan: {' '.join(cmd)}")
 
             # Execute Nmap
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = process.communicate()
-
-            # Read the text output from file
-            if self.txt_output_file.exists():
-                with open(self.txt_output_file, 'r') as f:
-                    raw_output = f.read()
-            else:
-                raw_output = stdout
+            # Parse the XML as it arrives while collecting stderr
+            xml_ports, stderr = await asyncio.gather(
+                self._read_xml_ports(process.stdout),
+                process.stderr.read()
+            )
+            await process.wait()
+            stderr = stderr.decode(errors='replace')
+            if process.returncode != 0:
+                logger.error(
+                    f"Nmap exited with code {process.returncode}: {stderr.strip()}")
 
-            self.results['raw_output'] = raw_output
             self.results['status'] = 'completed' if process.returncode == 0 else 'failed'
             self.results['error'] = stderr if process.returncode != 0 else None
 
-            # Parse ports from raw_output and add to results
-            self.results['ports'] = self.parse_nmap_ports(raw_output)
+            # Prefer ports from the XML, falling back to the text report.
+            # The report itself stays in txt_file rather than the JSON.
+            ports = xml_ports
+            if not ports and self.txt_output_file.exists():
+                with open(self.txt_output_file, 'r') as f:
+                    ports = self.parse_nmap_ports(f.read())
+            self.results['ports'] = ports
 
             # Save JSON
-            with open(self.json_output_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            json_io.dump(self.results, self.json_output_file)
 
             logger.info(
                 f"Nmap scan completed. Results saved to {self.txt_output_file} and {self.json_output_file}")
@@ -72,33 +97,71 @@ class NmapScanner:
             self.results['error'] = error_msg
             self.results['status'] = 'failed'
             # Save JSON with error
-            with open(self.json_output_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            json_io.dump(self.results, self.json_output_file)
             return self.results
 
-    def parse_nmap_ports(self, raw_output):
-        import re
-        ports = []
-        in_ports = False
-        for line in raw_output.splitlines():
-            if line.strip().startswith("PORT"):
-                in_ports = True
-                continue
-            if in_ports:
-                if not line.strip() or line.startswith("Nmap done") or line.startswith("#"):
+    async def _read_xml_ports(self, stream) -> List[Dict[str, str]]:
+        """
+        Incrementally parse Nmap XML from a stream, keeping one host in memory
+        """
+        parser = ET.XMLPullParser(events=('end',))
+        ports: List[Dict[str, str]] = []
+        try:
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
                     break
-                m = re.match(r"^(\d+)/(\w+)\s+(\w+)\s+(\S+)(\s+.+)?$", line.strip())
-                if m:
-                    port, proto, state, service, version = m.groups()
-                    ports.append({
-                        "port": port,
-                        "protocol": proto,
-                        "state": state,
-                        "service": service,
-                        "version": (version or "").strip()
-                    })
+                parser.feed(chunk)
+                self._collect_host_ports(parser, ports)
+            parser.close()
+        except ET.ParseError as e:
+            # Truncated XML, e.g. nmap failed; keep the hosts parsed so far
+            logger.warning(f"Incomplete Nmap XML output: {e}")
+            # Drain the rest so nmap is not blocked on a full pipe
+            while await stream.read(65536):
+                pass
         return ports
 
+    def _collect_host_ports(self, parser, ports: List[Dict[str, str]]) -> None:
+        """Extract ports from each completed <host> element, then free it"""
+        for _, host in parser.read_events():
+            if host.tag != 'host':
+                continue
+            address = host.find('address')
+            addr = address.get('addr', '') if address is not None else ''
+            for port in host.iterfind('ports/port'):
+                state = port.find('state')
+                service = port.find('service')
+                version = ''
+                if service is not None:
+                    parts = [service.get('product'), service.get('version')]
+                    if service.get('extrainfo'):
+                        parts.append(f"({service.get('extrainfo')})")
+                    version = ' '.join(p for p in parts if p)
+                ports.append({
+                    "host": addr,
+                    "port": port.get('portid', ''),
+                    "protocol": port.get('protocol', ''),
+                    "state": state.get('state', '') if state is not None else '',
+                    "service": service.get('name', '') if service is not None else '',
+                    "version": version
+                })
+            host.clear()
+            # lxml keeps cleared siblings attached to the root; drop them
+            if hasattr(host, 'getprevious'):
+                while host.getprevious() is not None:
+                    del host.getparent()[0]
+
+    def parse_nmap_ports(self, raw_output):
+        """Extract port rows from Nmap's normal (-oN) output"""
+        return [{
+            "port": m[1],
+            "protocol": m[2],
+            "state": m[3],
+            "service": m[4],
+            "version": (m[5] or "").strip()
+        } for m in _PORT_RE.finditer(raw_output)]
+
     def save_results(self, output_file: Optional[str] = None) -> str:
         """
         Save scan results to a JSON file (already handled in run_scan, but kept for compatibility)
@@ -107,8 +170,7 @@ class NmapScanner:
             output_file = self.json_output_file
         else:
             output_file = Path(output_file)
-        with open(output_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        json_io.dump(self.results, output_file)
         logger.info(f"Saved Nmap scan results to {output_file}")
         return str(output_file)
 
@@ -1,67 +1,166 @@
-import subprocess
+import asyncio
+import functools
 import json
-import tempfile
+import logging
 import os
+import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Sequence, Union
 import time
+from datetime import datetime, timezone
 
 from utils.logger import get_logger
+from utils import json_io
 
 logger = get_logger()
 
 
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string with second precision"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+# Plugins stored under a single key (first string only); '' means skipped
+_SPECIAL_PLUGINS = {
+    'HTTPServer': 'web_server',
+    'Title': 'title',
+    'IP': '',
+}
+
+# WhatWeb arguments: a command-line string, a sequence of tokens, or None
+# for WhatWebScanner._DEFAULT_ARGS
+WhatWebArgs = Union[str, Sequence[str], None]
+
+# Schemes a target may already carry
+_URL_PREFIXES = ('http://', 'https://')
+
+# Characters in a URL target that are unsafe in a filename
+_SAFE = str.maketrans({'/': '_', ':': '_', '?': '_'})
+
+_DECODER = json.JSONDecoder()
+_WS = ' \t\r\n'
+
+
+def _iter_json_items(text: str) -> Iterator[Any]:
+    """
+    Decode the elements of a JSON array one at a time
+
+    Elements after the ones consumed are never parsed. Yields nothing for
+    empty output, an empty array, or a non-array document.
+    """
+    pos = len(text) - len(text.lstrip(_WS))
+    if text[pos:pos + 1] != '[':
+        if pos < len(text):
+            # Not an array: still decode it so malformed output raises
+            json.loads(text)
+        return
+    pos += 1
+    while True:
+        while pos < len(text) and text[pos] in _WS:
+            pos += 1
+        if text[pos:pos + 1] == ']':
+            return
+        item, pos = _DECODER.raw_decode(text, pos)
+        yield item
+        while pos < len(text) and text[pos] in _WS:
+            pos += 1
+        if text[pos:pos + 1] == ',':
+            pos += 1
+
+
+def _first_json_item(text: str) -> Optional[Any]:
+    """Decode only the first element of a JSON array, or None if there is none"""
+    return next(_iter_json_items(text), None)
+
+
+def _result_url(result: Dict[str, Any]) -> str:
+    """URL of a WhatWeb result; 'target' is the URL string in --log-json output"""
+    target = result.get('target')
+    return target if isinstance(target, str) else (target or {}).get('url', '')
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create an output directory once per process"""
+    os.makedirs(path, exist_ok=True)
+
+
 class WhatWebScanner:
-    def __init__(self, target: str, output_dir: str = "output/reports"):
+    __slots__ = ('target', '_safe_target', 'output_dir', 'binary_path',
+                 'output_file', 'results')
+
+    _DEFAULT_ARGS = ("--color=never", "--no-errors", "-a", "3")
+
+    # Copied per instance; keys in the order results are reported
+    _RESULT_TEMPLATE = {
+        'target': None,
+        'scan_results': None,
+        'status': 'pending',
+        'start_time': None,
+        'end_time': None,
+        'duration_ms': None,
+        'error': None
+    }
+
+    def __init__(self, target: str, output_dir: str = "output/reports",
+                 binary_path: Optional[str] = None):
         self.target = self._normalize_target(target)
+        self._safe_target = self.target.translate(_SAFE)
         self.output_dir = output_dir
+        self.binary_path = binary_path or shutil.which("whatweb") or "whatweb"
         self.output_file = Path(
-            self.output_dir) / f"whatweb_scan_{self.target.replace('/', '_')}.json"
-        self.results = {
-            'target': self.target,
-            'scan_results': {},
-            'status': 'pending',
-            'start_time': None,
-            'end_time': None,
-            'error': None
-        }
-        os.makedirs(self.output_dir, exist_ok=True)
+            self.output_dir) / f"whatweb_scan_{self._safe_target}.json"
+        self.results = self._RESULT_TEMPLATE.copy()
+        self.results['target'] = self.target
+        # The template's nested dict must not be shared between scanners
+        self.results['scan_results'] = {}
+        _ensure_dir(self.output_dir)
+
+    @classmethod
+    def _split_args(cls, arguments: WhatWebArgs) -> Sequence[str]:
+        """Turn the accepted argument forms into a token sequence"""
+        if arguments is None:
+            return cls._DEFAULT_ARGS
+        if isinstance(arguments, str):
+            return arguments.split()
+        return tuple(arguments)
 
     def _normalize_target(self, target: str) -> str:
         """Ensure target has http:// or https:// prefix"""
-        if not (target.startswith('http://') or target.startswith('https://')):
+        if not target.startswith(_URL_PREFIXES):
             return f"http://{target}"
         return target
 
-    def run_scan(self, arguments: str = "--color=never --no-errors -a 3") -> Dict[str, Any]:
-        """Run WhatWeb scan with specified arguments"""
-        try:
-            # Create temp file for output
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp:
-                temp_path = tmp.name
+    def run_scan(self, arguments: WhatWebArgs = None) -> Dict[str, Any]:
+        """Run WhatWeb scan with specified arguments (defaults when None)"""
+        return asyncio.run(self.run_scan_async(arguments))
 
-            # Build command
-            cmd = ["whatweb", "--log-json", temp_path]
-            if arguments:
-                cmd.extend(arguments.split())
-            cmd.append(self.target)
+    async def run_scan_async(self, arguments: WhatWebArgs = None) -> Dict[str, Any]:
+        """Run WhatWeb scan without blocking the event loop"""
+        try:
+            # Build command; JSON goes to stdout and -q keeps the brief log out of it
+            cmd = (self.binary_path, "-q", "--log-json=-",
+                   *self._split_args(arguments), self.target)
 
-            logger.info(f"Running: {' '.join(cmd)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Running: %s", ' '.join(cmd))
 
             # Update status
             self.results['status'] = 'running'
-            self.results['start_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            self.results['start_time'] = _now()
+            started = time.monotonic()
 
             # Execute
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
 
             # Wait for completion
-            stdout, stderr = process.communicate()
+            stdout, stderr = await process.communicate()
+            self.results['duration_ms'] = int((time.monotonic() - started) * 1000)
+            stderr = stderr.decode(errors='replace')
 
             # Handle errors
             if process.returncode != 0:
@@ -72,16 +171,10 @@ class WhatWebScanner:
                 return self.results
 
             # Parse results
-            self._parse_results(temp_path)
-
-            # Cleanup
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            self._parse_results(stdout)
 
             self.results['status'] = 'completed'
-            self.results['end_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            self.results['end_time'] = _now()
 
             return self.results
 
@@ -92,58 +185,200 @@ class WhatWebScanner:
             self.results['status'] = 'failed'
             return self.results
 
-    def _parse_results(self, file_path: str) -> None:
-        """Parse WhatWeb JSON output"""
+    @classmethod
+    async def scan_many(cls, targets: List[str], concurrency: int = 32,
+                        arguments: WhatWebArgs = None,
+                        output_dir: str = "output/reports") -> List[Dict[str, Any]]:
+        """
+        Scan several targets concurrently on one event loop
+
+        Args:
+            targets: Targets to scan
+            concurrency: Maximum number of WhatWeb processes at a time
+            arguments: WhatWeb arguments used for every target; a string,
+                a sequence of tokens, or None for the defaults
+            output_dir: Directory for the scanners' output files
+
+        Returns:
+            List of results in the same order as targets
+        """
+        arguments = cls._split_args(arguments)
+        semaphore = asyncio.Semaphore(concurrency)
+        binary_path = shutil.which("whatweb")
+
+        async def scan_one(scanner: "WhatWebScanner") -> Dict[str, Any]:
+            async with semaphore:
+                return await scanner.run_scan_async(arguments)
+
+        scanners = [cls(t, output_dir, binary_path) for t in targets]
+        return await asyncio.gather(*(scan_one(s) for s in scanners))
+
+    @classmethod
+    def run_batch(cls, targets: List[str], arguments: WhatWebArgs = None,
+                  output_dir: str = "output/reports", batch_size: int = 50,
+                  concurrency: int = 4) -> List[Dict[str, Any]]:
+        """Scan many targets with one WhatWeb process per batch_size targets"""
+        return asyncio.run(cls.run_batch_async(targets, arguments, output_dir,
+                                               batch_size, concurrency))
+
+    @classmethod
+    async def run_batch_async(cls, targets: List[str], arguments: WhatWebArgs = None,
+                              output_dir: str = "output/reports",
+                              batch_size: int = 50,
+                              concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Scan many targets, passing up to batch_size URLs to each WhatWeb run
+
+        WhatWeb accepts several targets on one command line, so the Ruby
+        interpreter start-up is paid once per batch instead of per target.
+
+        Args:
+            targets: Targets to scan
+            arguments: WhatWeb arguments used for every target; a string,
+                a sequence of tokens, or None for the defaults
+            output_dir: Directory for the scanners' output files
+            batch_size: Maximum number of targets per WhatWeb process
+            concurrency: Maximum number of WhatWeb processes at a time
+
+        Returns:
+            List of results in the same order as targets
+        """
+        arguments = cls._split_args(arguments)
+        binary_path = shutil.which("whatweb")
+        scanners = [cls(t, output_dir, binary_path) for t in targets]
+        batches = [scanners[i:i + batch_size]
+                   for i in range(0, len(scanners), batch_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scan_one(batch: List["WhatWebScanner"]) -> None:
+            async with semaphore:
+                await cls._scan_batch(batch, arguments)
+
+        await asyncio.gather(*(scan_one(b) for b in batches))
+        return [s.results for s in scanners]
+
+    @staticmethod
+    async def _scan_batch(scanners: List["WhatWebScanner"], arguments: WhatWebArgs) -> None:
+        """Run one WhatWeb process for scanners and hand each its result"""
+        for scanner in scanners:
+            scanner.results['status'] = 'running'
+            scanner.results['start_time'] = _now()
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            cmd = (scanners[0].binary_path, "-q", "--log-json=-",
+                   *scanners[0]._split_args(arguments),
+                   *(s.target for s in scanners))
 
-            if not isinstance(data, list) or not data:
-                return
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Running: %s", ' '.join(cmd))
+
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            duration_ms = int((time.monotonic() - started) * 1000)
+
+            if process.returncode != 0:
+                raise RuntimeError(f"WhatWeb error: {stderr.decode(errors='replace')}")
+
+            # Hand each result to the first scanner still waiting for its URL
+            waiting: Dict[str, List["WhatWebScanner"]] = {}
+            for scanner in reversed(scanners):
+                waiting.setdefault(scanner.target.rstrip('/'), []).append(scanner)
+            # Every element is used here, so decode the whole array at once
+            results = json_io.loads(stdout) if stdout.strip() else []
+            if not isinstance(results, list):
+                results = []
+            matched = set()
+            for result in results:
+                # A malformed element is skipped rather than failing the batch
+                try:
+                    pending = waiting.get(_result_url(result).rstrip('/'))
+                    if pending:
+                        scanner = pending[-1]
+                        scanner._store_result(result)
+                        pending.pop()
+                        matched.add(id(scanner))
+                except Exception as e:
+                    logger.warning("Skipping malformed WhatWeb result: %s", e)
 
-            # Extract relevant info from first result
-            result = data[0]
-            self.results['scan_results'] = {
-                'url': result.get('target', {}).get('url', ''),
-                'ip': result.get('plugins', {}).get('IP', {}).get('string', [None])[0],
-                'http_status': result.get('http_status', 0),
-                'technologies': self._extract_technologies(result.get('plugins', {})),
-                'headers': result.get('headers', {})
-            }
+            end_time = _now()
+            for scanner in scanners:
+                scanner.results['duration_ms'] = duration_ms
+                scanner.results['end_time'] = end_time
+                if id(scanner) in matched:
+                    scanner.results['status'] = 'completed'
+                else:
+                    scanner.results['error'] = "No WhatWeb result for target"
+                    scanner.results['status'] = 'failed'
+
+        except Exception as e:
+            error_msg = f"Error in WhatWeb batch scan: {str(e)}"
+            logger.error(error_msg)
+            for scanner in scanners:
+                scanner.results['error'] = error_msg
+                scanner.results['status'] = 'failed'
+
+    def _parse_results(self, output: bytes) -> None:
+        """Parse WhatWeb JSON output captured from stdout"""
+        if not output:
+            return
+        try:
+            # Only the first result is used, so stop decoding after it
+            result = _first_json_item(output.decode(errors='replace'))
+            if not isinstance(result, dict):
+                return
+            self._store_result(result)
 
         except Exception as e:
             error_msg = f"Error parsing WhatWeb results: {str(e)}"
             logger.error(error_msg)
             self.results['error'] = error_msg
 
+    def _store_result(self, result: Dict[str, Any]) -> None:
+        """Extract relevant info from one WhatWeb result"""
+        self.results['scan_results'] = {
+            'url': _result_url(result),
+            'ip': result.get('plugins', {}).get('IP', {}).get('string', [None])[0],
+            'http_status': result.get('http_status', 0),
+            'technologies': self._extract_technologies(result.get('plugins', {})),
+            'headers': result.get('headers', {})
+        }
+
     def _extract_technologies(self, plugins: Dict) -> Dict[str, List[str]]:
         """Extract technology information from plugins"""
         tech = {}
         for name, data in plugins.items():
-            if name == 'HTTPServer':
-                tech['web_server'] = data.get('string', [None])[0]
-            elif name == 'Title':
-                tech['title'] = data.get('string', [None])[0]
-            elif name not in ['IP', 'HTTPServer', 'Title']:
-                if name not in tech:
-                    tech[name] = []
-                if isinstance(data.get('string'), list):
-                    tech[name].extend([s for s in data['string'] if s])
+            spec = _SPECIAL_PLUGINS.get(name)
+            if spec is not None:
+                # Single-valued plugins; IP has no key and is skipped
+                if spec:
+                    strings = data.get('string')
+                    tech[spec] = strings[0] if strings else None
+                continue
+            bucket = tech.setdefault(name, [])
+            strings = data.get('string')
+            if isinstance(strings, list):
+                bucket.extend(filter(None, strings))
         return tech
 
-    def save_results(self, output_file: Optional[str] = None) -> str:
-        """Save scan results to JSON file"""
+    def save_results(self, output_file: Optional[str] = None, pretty: bool = False,
+                     durable: bool = False) -> str:
+        """
+        Save scan results to JSON file, compact unless pretty is set
+
+        The file is replaced atomically; durable also fsyncs it first.
+        """
         try:
-            if not output_file:
-                output_file = self.output_file
-            else:
-                output_file = Path(output_file)
+            # Convert the destination to a string once and reuse it
+            path = os.fspath(output_file or self.output_file)
 
-            with open(output_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            json_io.dump_atomic(self.results, path, pretty, durable)
 
-            logger.info(f"Results saved to {output_file}")
-            return str(output_file)
+            logger.info("Results saved to %s", path)
+            return path
 
         except Exception as e:
             error_msg = f"Error saving results: {str(e)}"
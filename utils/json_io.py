@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib json encoder
+    orjson = None
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize obj to JSON bytes
+
+    Args:
+        obj: Object to serialize
+        pretty: Indent with two spaces instead of writing compact JSON
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def loads(data) -> Any:
+    """
+    Deserialize JSON from bytes or str
+
+    Args:
+        data: JSON document
+
+    Returns:
+        The decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump(obj: Any, path, pretty: bool = False) -> None:
+    """
+    Serialize obj to a JSON file with a single buffered write
+
+    Args:
+        obj: Object to serialize
+        path: Destination file path
+        pretty: Indent with two spaces instead of writing compact JSON
+    """
+    with open(path, 'wb', buffering=65536) as f:
+        f.write(dumps(obj, pretty))
+
+
+def dump_atomic(obj: Any, path, pretty: bool = False, durable: bool = False) -> None:
+    """
+    Serialize obj to a temporary file and move it over path
+
+    Readers see either the previous file or the complete new one, never a
+    partial write.
+
+    Args:
+        obj: Object to serialize
+        path: Destination file path
+        pretty: Indent with two spaces instead of writing compact JSON
+        durable: fsync the data before the rename
+    """
+    data = dumps(obj, pretty)
+    path = os.fspath(path)
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp, 'wb', buffering=65536) as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -1,21 +1,48 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 import json
 
+# Guards one-time creation and setup of the Logger singleton
+_INIT_LOCK = threading.Lock()
+
+class _LazyKV:
+    """Serializes log kwargs to JSON only when the record is formatted"""
+    __slots__ = ('kv',)
+    
+    def __init__(self, kv):
+        self.kv = kv
+    
+    def __str__(self):
+        return json.dumps(self.kv, default=str)
+
 class Logger:
+    __slots__ = ('_initialized', 'log_file', 'log_level', 'logger',
+                 '_handlers', '_queue_handler', '_listener', '_fork_paused')
     _instance = None
     
     def __new__(cls, log_file='netmaptool.log', log_level='INFO'):
         if cls._instance is None:
-            cls._instance = super(Logger, cls).__new__(cls)
-            cls._instance._initialized = False
+            with _INIT_LOCK:
+                if cls._instance is None:
+                    instance = super(Logger, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self, log_file='netmaptool.log', log_level='INFO'):
         if self._initialized:
             return
-            
+        with _INIT_LOCK:
+            if not self._initialized:
+                self._setup(log_file, log_level)
+                self._initialized = True
+    
+    def _setup(self, log_file, log_level):
         self.log_file = log_file
         self.log_level = getattr(logging, log_level.upper(), logging.INFO)
         
@@ -27,6 +54,12 @@ class Logger:
         # Configure logging
         self.logger = logging.getLogger('netmaptool')
         self.logger.setLevel(self.log_level)
+        # Records are handled here only, not again by the root logger
+        self.logger.propagate = False
+        
+        # Handlers may already exist if the module was reloaded
+        if self.logger.handlers:
+            return
         
         # Create file handler
         file_handler = logging.FileHandler(self.log_file)
@@ -41,20 +74,64 @@ class Logger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        
-        self._initialized = True
+        # Log calls only enqueue the record; a listener thread does the
+        # formatting and the writes
+        self._handlers = (file_handler, console_handler)
+        self._queue_handler = QueueHandler(queue.SimpleQueue())
+        self.logger.addHandler(self._queue_handler)
+        self._listener = None
+        self._fork_paused = False
+        self._start_listener(self._queue_handler.queue)
+        atexit.register(self._stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            # The listener must not be mid-write when the process forks, or
+            # the child inherits a locked handler stream
+            os.register_at_fork(before=self._before_fork,
+                                after_in_parent=self._after_fork_in_parent,
+                                after_in_child=self._after_fork_in_child)
+    
+    def _start_listener(self, log_queue):
+        """Start a listener thread draining log_queue into the handlers"""
+        self._queue_handler.queue = log_queue
+        self._listener = QueueListener(log_queue, *self._handlers,
+                                       respect_handler_level=True)
+        self._listener.start()
+    
+    def _before_fork(self):
+        """Drain and join the listener so no handler write is in progress"""
+        self._fork_paused = self._listener is not None
+        self._stop_listener()
+    
+    def _after_fork_in_parent(self):
+        # Records queued while paused are picked up by the new listener
+        if self._fork_paused:
+            self._start_listener(self._queue_handler.queue)
+    
+    def _after_fork_in_child(self):
+        # Anything still queued belongs to the parent; start from a fresh queue
+        if self._fork_paused:
+            self._start_listener(queue.SimpleQueue())
+    
+    def _stop_listener(self):
+        """Flush queued records and stop the listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
     
     def get_logger(self):
         return self.logger
     
     def log(self, level, message, **kwargs):
-        log_func = getattr(self.logger, level.lower(), self.logger.info)
+        level_no = logging.getLevelName(level.upper())
+        if not isinstance(level_no, int):
+            level_no = logging.INFO
+        # Skip records that would be dropped before building any arguments
+        if not self.logger.isEnabledFor(level_no):
+            return
         if kwargs:
-            message = f"{message} - {json.dumps(kwargs, default=str)}"
-        log_func(message)
+            self.logger.log(level_no, "%s - %s", message, _LazyKV(kwargs))
+        else:
+            self.logger.log(level_no, message)
 
 # Create a default logger instance
 def get_logger():
@@ -0,0 +1,62 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.logger import get_logger
+from utils import json_io
+
+logger = get_logger()
+
+# Default time-to-live for cached scan results, in seconds
+DEFAULT_TTL = 3600
+
+
+def make_key(target: str, tool: str, arguments: str) -> str:
+    """Build the cache key for a (target, tool, arguments) scan"""
+    return hashlib.sha1(f"{target}|{tool}|{arguments}".encode()).hexdigest()
+
+
+class ScanCache:
+    """
+    On-disk cache of completed scan results
+
+    Results are stored as one JSON file per key under cache_dir. An entry's
+    age is its file's mtime, so there is no shared index for concurrent
+    processes to race on; each put atomically replaces a single file.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for key, or None if missing or expired
+
+        Args:
+            key: Cache key from make_key()
+            ttl: Maximum age in seconds; defaults to the cache's ttl
+        """
+        if ttl is None:
+            ttl = self.ttl
+        path = self._path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime >= ttl:
+                return None
+            with open(path, 'rb') as f:
+                return json_io.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a completed scan result under key"""
+        json_io.dump_atomic(result, self._path(key))